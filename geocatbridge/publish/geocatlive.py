@@ -68,6 +68,9 @@ class GeocatLiveServer(ServerBase):
     def closePublishing(self):
         self.geoserverServer().closePublishing()
 
+    def endPublishing(self):
+        self.geoserverServer().endPublishing()
+
     def publishStyle(self, layer):
         self.geoserverServer().publishStyle(layer)
         
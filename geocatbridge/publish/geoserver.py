@@ -1,17 +1,20 @@
 import os
 import shutil
-import json
 import webbrowser
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_STORED
 import sqlite3
 import secrets
+import hashlib
+import threading
+import lxml.etree as etree
+from concurrent.futures import ThreadPoolExecutor
 from bridgestyle import mapboxgl
 
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, HTTPError
 
 from qgis.core import QgsProject, QgsDataSourceUri
 
-from qgis.PyQt.QtCore import QCoreApplication, QByteArray, QBuffer, QIODevice
+from qgis.PyQt.QtCore import QCoreApplication, QByteArray, QBuffer, QIODevice, QFileInfo
 
 from qgis.PyQt.QtWidgets import QMessageBox
 
@@ -21,6 +24,24 @@ from .exporter import exportLayer
 from .serverbase import ServerBase
 from ..utils.files import tempFilenameInTempFolder, tempFolderInTempFolder
 from ..utils.services import addServicesForGeodataServer
+from ..utils import jsonutils
+
+# Maximum number of REST requests that are sent to GeoServer at the same time
+MAX_CONCURRENT_REQUESTS = 16
+
+MBSTYLE_XML = ("<style><name>{name}</name><workspace>{workspace}</workspace>"
+               "<format>mbstyle</format><filename>{name}.json</filename></style>")
+
+MVT_FORMAT = "application/vnd.mapbox-vector-tile"
+
+HEADERS_XML = {"Content-Type": "text/xml"}
+HEADERS_ZIP = {"Content-Type": "application/zip"}
+HEADERS_MBSTYLE = {"Content-Type": "application/vnd.geoserver.mbstyle+json"}
+
+# Fixed query parameters of the WMTS GetTile URLs used for vector tile sources (the layer name goes in between)
+WMTS_TILE_PARAMS = "REQUEST=GetTile&SERVICE=WMTS&VERSION=1.0.0"
+WMTS_TILE_SUFFIX = ("&STYLE=&TILEMATRIX=EPSG:900913:{z}&TILEMATRIXSET=EPSG:900913"
+                    "&FORMAT=" + MVT_FORMAT + "&TILECOL={x}&TILEROW={y}")
 
 
 class GeoserverServer(ServerBase):
@@ -48,6 +69,7 @@ class GeoserverServer(ServerBase):
                 self.url = url.strip("/") + "/rest"
         else:
             self.url = url
+        self._baseUrl = "/".join(self.url.split("/")[:-1])
 
         self.authid = authid
         self.storage = storage
@@ -56,10 +78,25 @@ class GeoserverServer(ServerBase):
         self.useVectorTiles = useVectorTiles
         self._isMetadataCatalog = False
         self._isDataCatalog = True
-        self._layersCache = {}
+        self._namesCache = {}
+        self._namesCacheWorkspace = None
+        self._publishingThread = None
+        self._workspaceCached = None
+        self._workspaceUrlCached = None
 
     @property
     def _workspace(self):
+        if self._workspaceCached is not None:
+            return self._workspaceCached
+        return self._workspaceFromProject()
+
+    @property
+    def _workspaceUrl(self):
+        if self._workspaceUrlCached is not None:
+            return self._workspaceUrlCached
+        return "%s/workspaces/%s" % (self.url, self._workspace)
+
+    def _workspaceFromProject(self):
         path = QgsProject.instance().absoluteFilePath()
         if path:
             return os.path.splitext(os.path.basename(path))[0]
@@ -67,6 +104,11 @@ class GeoserverServer(ServerBase):
             return ""
 
     def prepareForPublishing(self, onlySymbology):
+        # The project file name does not change while publishing, so only look it up once
+        self._workspaceCached = self._workspaceFromProject()
+        self._workspaceUrlCached = "%s/workspaces/%s" % (self.url, self._workspace)
+        self._publishingThread = threading.get_ident()
+        self._clearCache()
         if not onlySymbology:
             self.deleteWorkspace()
         self._ensureWorkspaceExists()
@@ -74,6 +116,7 @@ class GeoserverServer(ServerBase):
         self._exportedLayers = {}
         self._postgisDatastoreExists = False
         self._publishedLayers = set()
+        self._publishedFeatureTypes = set()
 
     def closePublishing(self):        
         if self.useVectorTiles:
@@ -81,14 +124,18 @@ class GeoserverServer(ServerBase):
             warnings = layerStylesAsMapboxFolder(self._publishedLayers, folder)
             for w in warnings:
                 self.logWarning(w)
-            self._editMapboxFiles(folder)
-            self.publishMapboxGLStyle(folder)
-            self._publishOpenLayersPreview(folder)
-
-    def _publishOpenLayersPreview(self, folder):
-        styleFilename = os.path.join(folder, "style.mapbox")
-        with open(styleFilename) as f:
-            style = f.read()
+            style = self._editMapboxFiles(folder)
+            self.publishMapboxGLStyle(style)
+            self._publishOpenLayersPreview(style, folder)
+
+    def endPublishing(self):
+        # The workspace is only cached for a single publication, as the project can be saved under another name
+        self._workspaceCached = None
+        self._workspaceUrlCached = None
+        self._publishingThread = None
+        self._clearCache()
+
+    def _publishOpenLayersPreview(self, style, folder):
         template = "var style = %s;\nvar map = olms.apply('map', style);" % style
         
         jsFilename = os.path.join(folder, "mapbox.js")
@@ -108,28 +155,27 @@ class GeoserverServer(ServerBase):
 
     def _editMapboxFiles(self, folder):        
         filename = os.path.join(folder, "style.mapbox")
-        with open(filename) as f:
-            mapbox = json.load(f)
-        sources = mapbox["sources"]
-        for name in sources.keys():
-            url = ("%s/gwc/service/wmts?REQUEST=GetTile&SERVICE=WMTS"
-                  "&VERSION=1.0.0&LAYER=%s:%s&STYLE=&TILEMATRIX=EPSG:900913:{z}"
-                  "&TILEMATRIXSET=EPSG:900913&FORMAT=application/vnd.mapbox-vector-tile"
-                  "&TILECOL={x}&TILEROW={y}" % (self.baseUrl(), self._workspace, name))
-            sourcedef = {
-                  "type": "vector",
-                  "tiles": [url],
-                  "minZoom": 0,
-                  "maxZoom": 14
-                }
-            sources[name] = sourcedef
-        with open(filename, "w") as f:
-            json.dump(mapbox, f)
+        with open(filename, "rb") as f:
+            mapbox = jsonutils.load(f)
+        # Only the layer name varies between the tile URLs of the sources
+        urlPrefix = f"{self.baseUrl()}/gwc/service/wmts?{WMTS_TILE_PARAMS}&LAYER={self._workspace}:"
+        sourcedef = {
+            "type": "vector",
+            "minZoom": 0,
+            "maxZoom": 14
+        }
+        mapbox["sources"] = {
+            name: dict(sourcedef, tiles=[urlPrefix + name + WMTS_TILE_SUFFIX]) for name in mapbox["sources"]
+        }
+        style = jsonutils.dumps(mapbox)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(style)
+        # Return the edited style, so it does not have to be read from disk again for publishing
+        return style
 
-    def publishMapboxGLStyle(self, folder):
+    def publishMapboxGLStyle(self, style):
         name = "mb_" + self._workspace
-        filename = os.path.join(folder, "style.mapbox")
-        self._publishStyle(name, filename)
+        self._publishStyle(name, style.encode("utf-8"))
 
     def publishStyle(self, layer):
         self._publishedLayers.add(layer)
@@ -143,6 +189,9 @@ class GeoserverServer(ServerBase):
         return styleFilename
 
     def publishLayer(self, layer, fields=None):        
+        # Layers with the same source share their exported file. Sources can be long connection strings,
+        # so exported files are looked up by a short digest of the source instead.
+        sourceKey = hashlib.blake2b(layer.source().encode(), digest_size=16).digest()
         if layer.type() == layer.VectorLayer:
             if layer.featureCount() == 0:
                 self.logError("Layer contains zero features and cannot be published")
@@ -154,20 +203,21 @@ class GeoserverServer(ServerBase):
                 db = PostgisServer("temp", uri.authConfigId(), uri.host(), uri.port(), uri.schema(), uri.database())
                 self._publishVectorLayerFromPostgis(layer, db)
             elif self.storage in [self.FILE_BASED, self.POSTGIS_MANAGED_BY_GEOSERVER]:
-                if layer.source() not in self._exportedLayers:
+                if sourceKey not in self._exportedLayers:
                     if self.storage == self.POSTGIS_MANAGED_BY_GEOSERVER:
                         path = exportLayer(layer, fields, toShapefile=True, force=True, log=self)
                         basename = os.path.splitext(path)[0]
                         zipfilename = basename + ".zip"
-                        with ZipFile(zipfilename, 'w') as z:
+                        # GeoServer unpacks the zip right away, so compressing it is not worth the CPU time
+                        with ZipFile(zipfilename, 'w', compression=ZIP_STORED) as z:
                             for ext in [".shp", ".shx", ".prj", ".dbf"]:
                                 filetozip = basename + ext
                                 z.write(filetozip, arcname=os.path.basename(filetozip))
-                        self._exportedLayers[layer.source()] = zipfilename
+                        self._exportedLayers[sourceKey] = zipfilename
                     else:
                         path = exportLayer(layer, fields, log=self)
-                        self._exportedLayers[layer.source()] = path
-                filename = self._exportedLayers[layer.source()]
+                        self._exportedLayers[sourceKey] = path
+                filename = self._exportedLayers[sourceKey]
                 if self.storage == self.FILE_BASED:
                     self._publishVectorLayerFromFile(layer, filename)
                 else:
@@ -182,25 +232,25 @@ class GeoserverServer(ServerBase):
                 db.importLayer(layer, fields)
                 self._publishVectorLayerFromPostgis(layer, db)
         elif layer.type() == layer.RasterLayer:
-            if layer.source() not in self._exportedLayers:
+            if sourceKey not in self._exportedLayers:
                 path = exportLayer(layer, fields, log=self)
-                self._exportedLayers[layer.source()] = path
-            filename = self._exportedLayers[layer.source()]
+                self._exportedLayers[sourceKey] = path
+            filename = self._exportedLayers[sourceKey]
             self._publishRasterLayer(filename, layer.name())
-        self._clearCache()
 
     def createPostgisDatastore(self):
         ws, name = self.postgisdb.split(":")
         if not self.datastoreExists(name):
             url = "%s/workspaces/%s/datastores/%s.json" % (self.url, ws, name)
             r = self.request(url)
-            datastore = r.json()["dataStore"]
+            datastore = jsonutils.loads(r.content)["dataStore"]
             newDatastore = {"dataStore": {"name": datastore["name"],
                                           "type": datastore["type"],
                                           "connectionParameters": datastore["connectionParameters"],
                                           "enabled": True}}
-            url = "%s/workspaces/%s/datastores" % (self.url, self._workspace)
+            url = "%s/datastores" % self._workspaceUrl
             r = self.request(url, newDatastore, "post")
+            self._addToCache("dataStore", name)
 
     def testConnection(self):
         try:
@@ -215,7 +265,7 @@ class GeoserverServer(ServerBase):
         self.deleteStyle(layer.name())
 
     def baseUrl(self):
-        return "/".join(self.url.split("/")[:-1])
+        return self._baseUrl
 
     def _publishVectorLayerFromFile(self, layer, filename):
         self.logInfo("Publishing layer from file: %s" % filename)
@@ -224,36 +274,58 @@ class GeoserverServer(ServerBase):
         if not isDataUploaded:
             with open(filename, "rb") as f:
                 self._deleteDatastore(name)
-                url = "%s/workspaces/%s/datastores/%s/file.gpkg?update=overwrite" % (self.url, self._workspace, name)
-                self.request(url, f.read(), "put")
-            conn = sqlite3.connect(filename)
-            cursor = conn.cursor()
-            cursor.execute("SELECT table_name FROM gpkg_geometry_columns")
-            tablename = cursor.fetchall()[0][0]
+                url = "%s/datastores/%s/file.gpkg?update=overwrite" % (self._workspaceUrl, name)
+                self.request(url, f, "put")
+            self._addToCache("dataStore", name)
+            tablename = self._gpkgTableName(layer, filename)
             self._uploadedDatasets[filename] = (name, tablename)
         datasetName, geoserverLayerName = self._uploadedDatasets[filename]
-        url = "%s/workspaces/%s/datastores/%s/featuretypes/%s.json" % (
-        self.url, self._workspace, datasetName, geoserverLayerName)
-        r = self.request(url)
-        ft = r.json()
-        ft["featureType"]["name"] = name
-        ft["featureType"]["title"] = name
+        if (datasetName, name) in self._publishedFeatureTypes:
+            self.logInfo("Feature type %s was already published from GPKG file '%s'" % (name, filename))
+            return
         ext = layer.extent()
-        ft["featureType"]["nativeBoundingBox"] = {
-            "minx": round(ext.xMinimum(), 5),
-            "maxx": round(ext.xMaximum(), 5),
-            "miny": round(ext.yMinimum(), 5),
-            "maxy": round(ext.yMaximum(), 5),
-            "srs": layer.crs().authid()
+        # GeoServer merges the given properties into the feature type, so there is no need to fetch it first
+        ft = {
+            "featureType": {
+                "name": name,
+                "nativeName": geoserverLayerName,
+                "title": name,
+                "nativeBoundingBox": {
+                    "minx": round(ext.xMinimum(), 5),
+                    "maxx": round(ext.xMaximum(), 5),
+                    "miny": round(ext.yMinimum(), 5),
+                    "maxy": round(ext.yMaximum(), 5),
+                    "srs": layer.crs().authid()
+                }
+            }
         }
         if isDataUploaded:
-            url = "%s/workspaces/%s/datastores/%s/featuretypes" % (self.url, self._workspace, datasetName)
+            url = "%s/datastores/%s/featuretypes" % (self._workspaceUrl, datasetName)
             r = self.request(url, ft, "post")
         else:
+            url = "%s/datastores/%s/featuretypes/%s.json" % (self._workspaceUrl, datasetName, geoserverLayerName)
             r = self.request(url, ft, "put")
+        self._addToCache("layer", name)
+        self._publishedFeatureTypes.add((datasetName, name))
         self.logInfo("Feature type correctly created from GPKG file '%s'" % filename)
         self._setLayerStyle(name, name)
 
+    def _gpkgTableName(self, layer, filename):
+        source = layer.source().split("|")
+        if filename != source[0]:
+            # The layer was exported by Bridge, and QGIS names the table after the file
+            return QFileInfo(filename).baseName()
+        for option in source[1:]:
+            if option.startswith("layername="):
+                return option[len("layername="):]
+        conn = sqlite3.connect(filename)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT table_name FROM gpkg_geometry_columns")
+            return cursor.fetchall()[0][0]
+        finally:
+            conn.close()
+
     def _publishVectorLayerFromPostgis(self, layer, db):
         name = layer.name()
         username, password = db.getCredentials()
@@ -279,16 +351,18 @@ class GeoserverServer(ServerBase):
                 }
             }
         }
-        dsUrl = "%s/workspaces/%s/datastores/" % (self.url, self._workspace)
+        dsUrl = "%s/datastores/" % self._workspaceUrl
         self.request(dsUrl, data=ds, method="post")
+        self._addToCache("dataStore", name)
         ft = {
             "featureType": {
                 "name": name,
                 "srs": layer.crs().authid()
             }
         }
-        ftUrl = "%s/workspaces/%s/datastores/%s/featuretypes" % (self.url, self._workspace, name)
+        ftUrl = "%s/datastores/%s/featuretypes" % (self._workspaceUrl, name)
         self.request(ftUrl, data=ft, method="post")
+        self._addToCache("layer", name)
         self._setLayerStyle(name, name)
 
     def _publishVectorLayerFromFileToPostgis(self, layer, filename):
@@ -314,38 +388,32 @@ class GeoserverServer(ServerBase):
             }
             url = "%s/imports" % (self.url)
             ret = self.request(url, _import, "post")
-            importId = ret.json()["import"]["id"]
+            importId = jsonutils.loads(ret.content)["import"]["id"]
             url = "%s/imports/%s/tasks" % (self.url, importId)
             with open(filename, "rb") as f:
                 files = {os.path.basename(filename): f}
                 ret = self.request(url, method="post", files=files)
-            taskId = ret.json()["task"]["id"]
-            target = {"dataStore": {
-                "name": datastoreName
-            }
-            }
-            url = "%s/imports/%s/tasks/%s/target" % (self.url, importId, taskId)
-            self.request(url, target, "put")
+            # Tasks take the target store given when creating the import, so it is not set again for the task
             url = "%s/imports/%s" % (self.url, importId)
             self.request(url, method="post")
             layername = os.path.splitext(os.path.basename(filename))[0]
             self._uploadedDatasets[filename] = (datastoreName, layername)
         datasetName, geoserverLayerName = self._uploadedDatasets[filename]
-        url = "%s/workspaces/%s/datastores/%s/featuretypes/%s.json" % (
-        self.url, self._workspace, datasetName, geoserverLayerName)
+        if (datasetName, name) in self._publishedFeatureTypes:
+            self.logInfo("Feature type %s was already published from file '%s'" % (name, filename))
+            return
+        url = "%s/datastores/%s/featuretypes/%s.json" % (self._workspaceUrl, datasetName, geoserverLayerName)
         r = self.request(url)
-        ft = r.json()
+        ft = jsonutils.loads(r.content)
         ft["featureType"]["name"] = name
         ft["featureType"]["title"] = name
         try:
-            ftUrl = "%s/workspaces/%s/datastores/%s/featuretypes" % (
-                self.url,
-                self._workspace,
-                datasetName,
-            )
+            ftUrl = "%s/datastores/%s/featuretypes" % (self._workspaceUrl, datasetName)
             r = self.request(ftUrl, ft, "post")
         except:
             r = self.request(url, ft, "put")
+        self._addToCache("layer", name)
+        self._publishedFeatureTypes.add((datasetName, name))
         self.logInfo("Feature type correctly created from GPKG file '%s'" % filename)
         self._setLayerStyle(name, name)
 
@@ -353,8 +421,9 @@ class GeoserverServer(ServerBase):
         # feedback.setText("Publishing data for layer %s" % layername)
         self._ensureWorkspaceExists()
         with open(filename, "rb") as f:
-            url = "%s/workspaces/%s/coveragestores/%s/file.geotiff" % (self.url, self._workspace, layername)
-            self.request(url, f.read(), "put")
+            url = "%s/coveragestores/%s/file.geotiff" % (self._workspaceUrl, layername)
+            self.request(url, f, "put")
+        self._addToCache("layer", layername)
         self.logInfo("Feature type correctly created from Tiff file '%s'" % filename)
         self._setLayerStyle(layername, layername)
 
@@ -375,46 +444,39 @@ class GeoserverServer(ServerBase):
         if styleExists:
             self.deleteStyle(name)
 
-        xml = "<style>" \
-              + "<name>{0}</name>".format(name) \
-              + "<workspace>{0}</workspace>".format(self._workspace) \
-              + "<format>" \
-              + "mbstyle" \
-              + "</format>" \
-              + "<filename>{0}.json</filename>".format(name) \
-              + "</style>"
+        xml = MBSTYLE_XML.format(name=name, workspace=self._workspace)
 
-        url = self.url + "/workspaces/%s/styles" % (self._workspace)
+        url = self._workspaceUrl + "/styles"
 
-        response = self.request(url, xml, "POST", {"Content-Type": "text/xml"})
-        url = self.url + "/workspaces/%s/styles/%s?raw=true" % (self._workspace, name)
+        response = self.request(url, xml, "POST", HEADERS_XML)
+        self._addToCache("style", name)
+        url = self._workspaceUrl + "/styles/%s?raw=true" % name
 
-        headers = {"Content-Type": "application/vnd.geoserver.mbstyle+json"}
-        response = self.request(url, mbstylestring, "PUT", headers)
+        response = self.request(url, mbstylestring, "PUT", HEADERS_MBSTYLE)
 
         # save sprite sheet
         # get png -> bytes
         if spriteSheet:
             img_bytes = self.getImageBytes(spriteSheet["img"])
             img2x_bytes = self.getImageBytes(spriteSheet["img2x"])
-            url = self.url + "/resource/workspaces/%s/styles/spriteSheet.png" % (self._workspace)
-            r = self.request(url, img_bytes, "PUT")
-            url = self.url + "/resource/workspaces/%s/styles/spriteSheet@2x.png" % (self._workspace)
-            r = self.request(url, img2x_bytes, "PUT")
-            url = self.url + "/resource/workspaces/%s/styles/spriteSheet.json" % (self._workspace)
-            r = self.request(url, spriteSheet["json"], "PUT")
-            url = self.url + "/resource/workspaces/%s/styles/spriteSheet@2x.json" % (self._workspace)
-            r = self.request(url, spriteSheet["json2x"], "PUT")
-            b = 1
-        a = 1
+            url = self.url + "/resource/workspaces/%s/styles/" % (self._workspace)
+            uploads = [
+                (url + "spriteSheet.png", img_bytes),
+                (url + "spriteSheet@2x.png", img2x_bytes),
+                (url + "spriteSheet.json", spriteSheet["json"]),
+                (url + "spriteSheet@2x.json", spriteSheet["json2x"])
+            ]
+            # The sprite sheet resources are independent of each other, so upload them at the same time
+            with ThreadPoolExecutor(max_workers=len(uploads)) as executor:
+                list(executor.map(lambda u: self.request(u[0], u[1], "PUT"), uploads))
 
     def getImageBytes(self, img):
         ba = QByteArray()
         buff = QBuffer(ba)
         buff.open(QIODevice.WriteOnly)
-        img.save(buff, "PNG")
-        img_bytes = ba.data()
-        return img_bytes
+        # Qt maps a PNG quality of 80 to zlib level 1, the fastest level that still compresses
+        img.save(buff, "PNG", 80)
+        return ba.data()
 
     def _publishGroup(self, group, qgis_layers):
         self._publishGroupMapBox(group, qgis_layers)
@@ -432,67 +494,85 @@ class GeoserverServer(ServerBase):
                                    "mode": "NAMED",
                                    "publishables": {"published": layers}}}
 
-        url = "%s/workspaces/%s/layergroups" % (self.url, self._workspace)
-        try:
-            self.request(url+"/"+group["name"], method="delete")  # delete if it exists
-        except:
-            pass
+        url = "%s/layergroups" % self._workspaceUrl
+        groupUrl = "%s/%s" % (url, group["name"])
         try:
+            # When republishing, the group usually exists already and can be updated in place
+            self.request(groupUrl, groupdef, "put")
+        except HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                # The existing group could not be updated (e.g. because its layers changed): recreate it
+                self.request(groupUrl, method="delete")
             self.request(url, groupdef, "post")
-        except:
-            self.request(url, groupdef, "put")
 
         # make sure there is VT format tiling
         url = "%s/gwc/rest/layers/%s:%s.xml" % (self.url.replace("/rest", ""), self._workspace, group["name"])
         r = self.request(url)
-        xml = r.text
-        if "application/vnd.mapbox-vector-tile" not in xml:
-            xml = xml.replace("<mimeFormats>", "<mimeFormats><string>application/vnd.mapbox-vector-tile</string>")
-            r = self.request(url, xml, "PUT", {"Content-Type": "text/xml"})
+        root = etree.fromstring(r.content)
+        mimeFormats = root.find("mimeFormats")
+        if mimeFormats is not None and MVT_FORMAT not in (f.text for f in mimeFormats):
+            mimeFormat = etree.Element("string")
+            mimeFormat.text = MVT_FORMAT
+            mimeFormats.insert(0, mimeFormat)
+            r = self.request(url, etree.tostring(root), "PUT", HEADERS_XML)
 
 
         self.logInfo("Group %s correctly created" % group["name"])
 
     def deleteStyle(self, name):
         if self.styleExists(name):
-            url = "%s/workspaces/%s/styles/%s?purge=true&recurse=true" % (self.url, self._workspace, name)
+            url = "%s/styles/%s?purge=true&recurse=true" % (self._workspaceUrl, name)
             r = self.request(url, method="delete")
+            self._removeFromCache("style", name)
 
     def _clearCache(self):
-        self._layersCache = None
+        self._namesCache = {}
+
+    def _addToCache(self, category, name):
+        # Only update names that have already been fetched; the others are fetched when first needed
+        if category in self._namesCache:
+            self._namesCache[category].add(name)
+
+    def _removeFromCache(self, category, name):
+        if category in self._namesCache:
+            self._namesCache[category].discard(name)
+
+    def _names(self, url, category):
+        # While publishing, fetch all item names of a category once, and keep them up to date when items are
+        # added or deleted. Any other caller (e.g. the UI thread) always gets the current names from the server.
+        if self._publishingThread != threading.get_ident():
+            return self._fetchNames(url, category)
+        if self._namesCacheWorkspace != self._workspace:
+            # Names of layers, styles and datastores are only valid for a single workspace
+            self._clearCache()
+            self._namesCacheWorkspace = self._workspace
+        if category not in self._namesCache:
+            self._namesCache[category] = self._fetchNames(url, category)
+        return self._namesCache[category]
+
+    def _fetchNames(self, url, category):
+        r = self.request(url)
+        root = jsonutils.loads(r.content)["%ss" % category]
+        if root and category in root:
+            return {s["name"] for s in root[category]}
+        return set()
 
     def _exists(self, url, category, name):
         try:
-            if category != "layer" or self._layersCache is None:
-                r = self.request(url)
-                root = r.json()["%ss" % category]
-                if category in root:
-                    items = [s["name"] for s in root[category]]
-                    if category == "layer":
-                        self._layersCache = items
-                else:
-                    return False
-            else:
-                items = self._layersCache
-            return name in items
+            return name in self._names(url, category)
         except:
             return False
 
     def layerExists(self, name):
-        url = "%s/workspaces/%s/layers.json" % (self.url, self._workspace)
+        url = "%s/layers.json" % self._workspaceUrl
         return self._exists(url, "layer", name)
 
     def layers(self):
-        url = "%s/workspaces/%s/layers.json" % (self.url, self._workspace)
-        r = self.request(url)
-        root = r.json()["layers"]
-        if "layer" in root:
-            return [s["name"] for s in root["layer"]]
-        else:
-            return []
+        url = "%s/layers.json" % self._workspaceUrl
+        return list(self._names(url, "layer"))
 
     def styleExists(self, name):
-        url = "%s/workspaces/%s/styles.json" % (self.url, self._workspace)
+        url = "%s/styles.json" % self._workspaceUrl
         return self._exists(url, "style", name)
 
     def workspaceExists(self):
@@ -508,21 +588,25 @@ class GeoserverServer(ServerBase):
             return False
 
     def datastoreExists(self, name):
-        url = "%s/workspaces/%s/datastores.json" % (self.url, self._workspace)
+        url = "%s/datastores.json" % self._workspaceUrl
         return self._exists(url, "dataStore", name)
 
     def _deleteDatastore(self, name):
-        url = "%s/workspaces/%s/datastores/%s?recurse=true" % (self.url, self._workspace, name)
+        url = "%s/datastores/%s?recurse=true" % (self._workspaceUrl, name)
         try:
             r = self.request(url, method="delete")
+            self._removeFromCache("dataStore", name)
+            # Layers of the datastore have been deleted as well
+            self._namesCache.pop("layer", None)
         except:
             pass
 
     def deleteLayer(self, name, recurse=True):
         if self.layerExists(name):
             recurseParam = 'recurse=true' if recurse else ""
-            url = "%s/workspaces/%s/layers/%s.json?%s" % (self.url, self._workspace, name, recurseParam)
+            url = "%s/layers/%s.json?%s" % (self._workspaceUrl, name, recurseParam)
             r = self.request(url, method="delete")
+            self._removeFromCache("layer", name)
 
     def openPreview(self, names, bbox, srs):
         url = self.layerPreviewUrl(names, bbox, srs)
@@ -546,43 +630,60 @@ class GeoserverServer(ServerBase):
         return "%s/wfs" % (self.baseUrl())
 
     def setLayerMetadataLink(self, name, url):
-        layerUrl = "%s/workspaces/%s/layers/%s.json" % (self.url, self._workspace, name)
+        layerUrl = "%s/layers/%s.json" % (self._workspaceUrl, name)
         r = self.request(layerUrl)
-        resourceUrl = r.json()["layer"]["resource"]["href"]
-        r = self.request(resourceUrl)
-        layer = r.json()
-        key = "featureType" if "featureType" in layer else "coverage"
-        layer[key]["metadataLinks"] = {
-            "metadataLink": [
-                {
-                    "type": "text/html",
-                    "metadataType": "ISO19115:2003",
-                    "content": url
+        resource = jsonutils.loads(r.content)["layer"]["resource"]
+        # The resource class tells whether it is a feature type or a coverage, so it does not have to be fetched.
+        # Only the metadata links are sent, GeoServer keeps the other properties of the resource.
+        key = resource.get("@class", "featureType")
+        layer = {
+            key: {
+                "metadataLinks": {
+                    "metadataLink": [
+                        {
+                            "type": "text/html",
+                            "metadataType": "ISO19115:2003",
+                            "content": url
+                        }
+                    ]
                 }
-            ]
+            }
         }
-        r = self.request(resourceUrl, data=layer, method="put")
+        r = self.request(resource["href"], data=layer, method="put")
 
     def deleteWorkspace(self):
         if self.workspaceExists():
-            url = "%s/workspaces/%s?recurse=true" % (self.url, self._workspace)
+            url = "%s?recurse=true" % self._workspaceUrl
             r = self.request(url, method="delete")
-            self._clearCache()
+            self._removeFromCache("workspace", self._workspace)
+            # The workspace was deleted with all its contents
+            self._namesCache.update(layer=set(), style=set(), dataStore=set())
 
     def _publishStyle(self, name, styleFilename):
         self._ensureWorkspaceExists()
         styleExists = self.styleExists(name)
         if styleExists:
             method = "put"
-            url = self.url + "/workspaces/%s/styles/%s" % (self._workspace, name)
+            url = self._workspaceUrl + "/styles/%s" % name
         else:
-            url = self.url + "/workspaces/%s/styles?name=%s" % (self._workspace, name)
+            url = self._workspaceUrl + "/styles?name=%s" % name
             method = "post"
+        if isinstance(styleFilename, (bytes, bytearray)):
+            # An mbstyle that is already in memory
+            self.request(url, styleFilename, method, HEADERS_MBSTYLE)
+            self._addToCache("style", name)
+            self.logInfo(
+                QCoreApplication.translate(
+                    "GeocatBridge",
+                    "Style %s correctly created from mbstyle" % name,
+                )
+            )
+            return
         _, ext = os.path.splitext(styleFilename)
         if ext.lower() == ".zip":
-            headers = {"Content-type": "application/zip"}
             with open(styleFilename, "rb") as f:
-                self.request(url, f.read(), method, headers)
+                self.request(url, f, method, HEADERS_ZIP)
+            self._addToCache("style", name)
             self.logInfo(
                 QCoreApplication.translate(
                     "GeocatBridge",
@@ -590,9 +691,9 @@ class GeoserverServer(ServerBase):
                 )
             )
         elif ext.lower() == ".mapbox":
-            headers = {"Content-type": "application/vnd.geoserver.mbstyle+json"}
-            with open(styleFilename) as f:
-                self.request(url, f.read(), method, headers)
+            with open(styleFilename, "rb") as f:
+                self.request(url, f, method, HEADERS_MBSTYLE)
+            self._addToCache("style", name)
             self.logInfo(
                 QCoreApplication.translate(
                     "GeocatBridge",
@@ -603,13 +704,16 @@ class GeoserverServer(ServerBase):
 
 
     def _setLayerStyle(self, layername, stylename):
-        url = "%s/workspaces/%s/layers/%s.json" % (self.url, self._workspace, layername)
-        r = self.request(url)
-        layer = r.json()
-        styleUrl = "%s/workspaces/%s/styles/%s.json" % (self.url, self._workspace, stylename)
-        layer["layer"]["defaultStyle"] = {
-            "name": stylename,
-            "href": styleUrl
+        url = "%s/layers/%s.json" % (self._workspaceUrl, layername)
+        styleUrl = "%s/styles/%s.json" % (self._workspaceUrl, stylename)
+        # GeoServer merges the given properties into the layer, so there is no need to fetch it first
+        layer = {
+            "layer": {
+                "defaultStyle": {
+                    "name": stylename,
+                    "href": styleUrl
+                }
+            }
         }
         r = self.request(url, data=layer, method="put")
 
@@ -618,23 +722,32 @@ class GeoserverServer(ServerBase):
             url = "%s/workspaces" % self.url
             ws = {"workspace": {"name": self._workspace}}
             self.request(url, data=ws, method="post")
+            self._addToCache("workspace", self._workspace)
 
     def postgisDatastores(self):
         pg_datastores = []
         url = f"{self.url}/workspaces.json"
-        res = self.request(url).json().get("workspaces", {})
+        res = jsonutils.loads(self.request(url).content).get("workspaces", {})
         if not res:
             # There aren't any workspaces (and thus no dataStores)
             return pg_datastores
-        for ws_url in (s.get("href") for s in res.get("workspace", [])):
-            props = self.request(ws_url).json().get("workspace", {})
-            ws_name, ds_list_url = props.get("name"), props.get("dataStores")
-            res = self.request(ds_list_url).json().get("dataStores", {})
-            if not res:
-                # There aren't any dataStores for this workspace
-                continue
-            for ds_url in (s.get("href") for s in res.get("dataStore", [])):
-                ds = self.request(ds_url).json().get("dataStore", {})
+
+        def _getJson(url, key):
+            return jsonutils.loads(self.request(url).content).get(key, {})
+
+        # The REST API requires a request per workspace and per dataStore: issue them concurrently
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            ws_urls = [s.get("href") for s in res.get("workspace", [])]
+            ws_props = list(executor.map(lambda u: _getJson(u, "workspace"), ws_urls))
+            ds_lists = executor.map(lambda p: _getJson(p.get("dataStores"), "dataStores"), ws_props)
+            ds_entries = []
+            for props, res in zip(ws_props, ds_lists):
+                if not res:
+                    # There aren't any dataStores for this workspace
+                    continue
+                ds_entries.extend((props.get("name"), s.get("href")) for s in res.get("dataStore", []))
+            datastores = executor.map(lambda e: _getJson(e[1], "dataStore"), ds_entries)
+            for (ws_name, _), ds in zip(ds_entries, datastores):
                 ds_name, enabled, params = ds.get("name"), ds.get("enabled"), ds.get("connectionParameters", {})
                 # Only add dataStore if it is enabled and the "dbtype" parameter equals "postgis"
                 # Using the "type" property does not work in all cases (e.g. for JNDI connection pools)
@@ -644,18 +757,18 @@ class GeoserverServer(ServerBase):
         return pg_datastores
         
     def addPostgisDatastore(self, datastoreDef):        
-        url = "%s/workspaces/%s/datastores/" % (self.url, self._workspace)
+        url = "%s/datastores/" % self._workspaceUrl
         self.request(url, data=datastoreDef, method="post")
+        self._addToCache("dataStore", datastoreDef["dataStore"]["name"])
 
     def addOGCServers(self):
-        baseurl = "/".join(self.url.split("/")[:-1])
-        addServicesForGeodataServer(self.name, baseurl, self.authid)
+        addServicesForGeodataServer(self.name, self.baseUrl(), self.authid)
 
     # ensure that the geoserver we are dealing with is at least 2.13.2
     def checkMinGeoserverVersion(self, errors):
         try:
             url = "%s/about/version.json" % self.url
-            result = self.request(url).json()['about']['resource']
+            result = jsonutils.loads(self.request(url).content)['about']['resource']
         except:
             errors.add("Could not connect to Geoserver.  Please check the server settings (including password).")
             return
@@ -673,6 +786,10 @@ class GeoserverServer(ServerBase):
             pass
 
     def validateGeodataBeforePublication(self, errors, toPublish):
+        # A new publication starts here: the project might have been saved under another name
+        self._workspaceCached = None
+        self._workspaceUrlCached = None
+        self._clearCache()
         path = QgsProject.instance().absoluteFilePath()
         if not path:
             errors.add("QGIS Project is not saved. Project must be saved before publishing layers to GeoServer")
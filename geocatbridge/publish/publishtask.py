@@ -217,6 +217,9 @@ class PublishTask(QgsTask):
             self.exceptiontype, _, _ = sys.exc_info()
             self.exception = traceback.format_exc()
             return False
+        finally:
+            if self.geodataServer is not None:
+                self.geodataServer.endPublishing()
 
     def validateLayer(self, layer):
         warnings = []
@@ -1,5 +1,6 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from qgis.core import (
     QgsMessageLog,
@@ -8,6 +9,10 @@ from qgis.core import (
     QgsApplication
 )
 
+from ..utils import jsonutils
+
+HEADERS_JSON = {"Content-Type": "application/json"}
+
 class ServerBase():
 
     def __init__(self):
@@ -15,6 +20,13 @@ class ServerBase():
         self._errors = []
         self._username = None
         self._password = None
+        # Reuse connections across requests, so the TCP/TLS handshake is only done once per host.
+        # Requests that fail because of a gateway or an overloaded server are retried a few times.
+        self._session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retries)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def logInfo(self, text):
         QgsMessageLog.logMessage(text, 'GeoCat Bridge', level=Qgis.Info)
@@ -49,13 +61,15 @@ class ServerBase():
             return self._username, self._password
 
     def request(self, url, data=None, method="get", headers=None, files=None):
+        # data can also be an open file, which requests will stream instead of loading it in memory
+        # headers can be a shared constant, so it must never be modified here
         headers = headers or {}
         files = files or {}
         username, password = self.getCredentials()
-        req_method = getattr(requests, method.lower())
+        req_method = getattr(self._session, method.lower())
         if isinstance(data, dict):
-            data = json.dumps(data)
-            headers["content-type"] = "application/json"
+            data = jsonutils.dumps(data)
+            headers = dict(headers, **HEADERS_JSON)
         self.logInfo("Making %s request to '%s'" % (method, url))
         r = req_method(url, headers=headers, files=files, data=data, auth=(username, password))
         r.raise_for_status()
@@ -64,6 +78,9 @@ class ServerBase():
     def addOGCServers(self):
         pass
 
+    def endPublishing(self):
+        pass
+
     def validateGeodataBeforePublication(self, errors, toPublish):
         pass
 
@@ -1,5 +1,3 @@
-import json
-
 from qgis.PyQt.QtCore import QSettings
 
 from geocatbridge.publish.geonetwork import GeonetworkServer
@@ -7,6 +5,7 @@ from geocatbridge.publish.geoserver import GeoserverServer
 from geocatbridge.publish.geocatlive import GeocatLiveServer
 from geocatbridge.publish.mapserver import MapserverServer
 from geocatbridge.publish.postgis import PostgisServer
+from geocatbridge.utils import jsonutils
     
 SERVERS_SETTING = "geocatbridge/BridgeServers"
 
@@ -17,7 +16,7 @@ def readServers():
     try:
         value = QSettings().value(SERVERS_SETTING)
         if value is not None:
-            storedServers = json.loads(value)            
+            storedServers = jsonutils.loads(value)            
             for serverDef in storedServers:
                 try:
                     s = serverFromDefinition(serverDef)
@@ -35,7 +34,7 @@ def serversAsJsonString():
     for s in _servers.values():
         d = {k:v for k,v in s.__dict__.items() if not k.startswith("_")}
         servList.append((s.__class__.__name__, d)) 
-    return json.dumps(servList)
+    return jsonutils.dumps(servList)
 
 def _updateStoredServers():  
     QSettings().setValue(SERVERS_SETTING, serversAsJsonString())
@@ -1,5 +1,6 @@
 import os
-import json
+from functools import partial
+from requests.exceptions import RequestException
 from qgis.PyQt import uic
 from geocatbridge.publish.servers import *
 from geocatbridge.publish.geonetwork import GeonetworkServer
@@ -11,37 +12,79 @@ from qgis.PyQt.QtWidgets import (
     QSizePolicy, 
     QHBoxLayout, 
     QMessageBox, 
-    QLabel, 
     QMenu, 
     QListWidgetItem, 
-    QWidget,
     QFileDialog,
     QDialog
 )
-from qgis.PyQt.QtCore import Qt
-from qgis.PyQt.QtGui import QPixmap
+from qgis.PyQt.QtCore import Qt, QSize, QSignalBlocker
+from qgis.PyQt.QtGui import QIcon
 from qgis.gui import QgsMessageBar, QgsFileWidget, QgsAuthConfigSelect
-from qgis.core import Qgis
+from qgis.core import Qgis, QgsTask, QgsApplication, QgsMessageLog
 from geocatbridge.utils.gui import execute
+from geocatbridge.utils import jsonutils
 from .newdataset import NewDatasetDialog
 
 WIDGET, BASE = uic.loadUiType(os.path.join(os.path.dirname(__file__), 'serverconnectionswidget.ui'))
 
+ICONS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), "icons")
+
+_icons = {}
+
+def serverIcon(server):
+    clazz = server.__class__
+    if clazz not in _icons:
+        _icons[clazz] = QIcon(os.path.join(ICONS_FOLDER, "%s_black.png" % clazz.__name__.lower()[:-6]))
+    return _icons[clazz]
+
+def postgisDatastoreDefinition(dlg):
+    params = (("schema", dlg.schema), ("port", dlg.port), ("database", dlg.database), ("passwd", dlg.password),
+              ("user", dlg.username), ("host", dlg.host), ("dbtype", "postgis"))
+    return {
+        "dataStore": {
+            "name": dlg.name,
+            "type": "PostGIS",
+            "enabled": True,
+            "connectionParameters": {
+                "entry": [{"@key": k, "$": v} for k, v in params]
+            }
+        }
+    }
+
 class ServerConnectionsWidget(BASE, WIDGET):
 
+    NEW_SERVER_TYPES = (
+        ("GeoServer", GeoserverServer),
+        ("MapServer", MapserverServer),
+        ("GeoCat Live", GeocatLiveServer),
+        ("GeoNetwork", GeonetworkServer),
+        #("CSW", CswServer),
+        ("PostGIS", PostgisServer)
+    )
+
     def __init__(self):
         super(ServerConnectionsWidget, self).__init__()
         self.currentServer = None
+        self._itemsByName = {}
         self.setupUi(self)
         
         self.addMenuToButtonNew()
         self.addAuthWidgets()
         self.buttonRemove.clicked.connect(self.buttonRemoveClicked)
+        self.listServers.setIconSize(QSize(32, 32))
         self.populateServers()
         self.listServers.currentItemChanged.connect(self.currentServerChanged)
         self.bar = QgsMessageBar()
         self.bar.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
         self.layout().insertWidget(0, self.bar)
+        self._loaders = {
+            GeoserverServer: self._loadGeoserver,
+            MapserverServer: self._loadMapserver,
+            PostgisServer: self._loadPostgis,
+            GeonetworkServer: self._loadMetadataCatalog,
+            CswServer: self._loadMetadataCatalog,
+            GeocatLiveServer: self._loadGeocatLive
+        }
         self.setCurrentServer(None)
         self.buttonSave.clicked.connect(self.saveButtonClicked)
         self.comboGeoserverDataStorage.currentIndexChanged.connect(self.geoserverDatastorageChanged)        
@@ -52,21 +95,17 @@ class ServerConnectionsWidget(BASE, WIDGET):
         self.btnAddDatastore.clicked.connect(self.addPostgisDatastore)
         self.btnRefreshDatabases.clicked.connect(self.populatePostgisComboWithGeoserverPostgisServers)
 
-        self.txtCswName.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtCswNode.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtGeoserverName.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtPostgisName.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtGeoserverUrl.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtGeocatLiveName.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtCswUrl.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtPostgisServerAddress.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtPostgisPort.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtPostgisSchema.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtPostgisDatabase.textChanged.connect(self._setCurrentServerHasChanges)
-        self.txtGeocatLiveIdentifier.textChanged.connect(self._setCurrentServerHasChanges)
-        self.comboMetadataProfile.currentIndexChanged.connect(self._setCurrentServerHasChanges)
-        self.comboGeoserverDatabase.currentIndexChanged.connect(self._setCurrentServerHasChanges)
-
+        for w in (self.txtCswName, self.txtCswNode, self.txtCswUrl, self.txtGeoserverName, self.txtGeoserverUrl,
+                  self.txtPostgisName, self.txtPostgisServerAddress, self.txtPostgisPort, self.txtPostgisSchema,
+                  self.txtPostgisDatabase, self.txtGeocatLiveName, self.txtGeocatLiveIdentifier):
+            w.textChanged.connect(self._setCurrentServerHasChanges)
+        for w in (self.comboMetadataProfile, self.comboGeoserverDatabase):
+            w.currentIndexChanged.connect(self._setCurrentServerHasChanges)
+
+        self._mapserverLocalWidgets = (self.labelLocalFolder, self.fileMapserver)
+        self._mapserverRemoteWidgets = (self.labelRemoteFolder, self.txtRemoteFolder, self.labelHost, self.labelPort,
+                                        self.labelMapserverCredentials, self.txtMapserverHost, self.txtMapserverPort,
+                                        self.mapserverAuthWidget)
         self.radioLocalPath.toggled.connect(self.mapserverStorageChanged)
 
         self.fileMapserver.setStorageMode(QgsFileWidget.GetDirectory)
@@ -90,19 +129,54 @@ class ServerConnectionsWidget(BASE, WIDGET):
         if filename:
             if not filename.endswith("json"):
                 filename += ".json"
-            with open(filename, "w") as f:
-                f.write(serversAsJsonString())
+            content = serversAsJsonString()
+            def _write(task):
+                with open(filename, "w", encoding="utf-8") as f:
+                    f.write(content)
+            self._saveTask = QgsTask.fromFunction(self.tr("Save servers"), _write, on_finished=self._serversSaved)
+            QgsApplication.taskManager().addTask(self._saveTask)
+
+    def _serversSaved(self, exception, result=None):
+        self._saveTask = None
+        if exception is not None:
+            QgsMessageLog.logMessage(str(exception), 'GeoCat Bridge', level=Qgis.Warning)
+            self.bar.pushMessage(self.tr("Could not save servers"), level=Qgis.Warning, duration=5)
 
     def loadServers(self):
         filename = QFileDialog.getOpenFileName(self, self.tr("Load servers"), "", '*.json')[0]
         if filename:
-            with open(filename) as f:
-                servers = json.load(f)
-            for server in servers:                
+            def _read(task):
+                with open(filename, "rb") as f:
+                    return jsonutils.load(f)
+            self._loadTask = QgsTask.fromFunction(self.tr("Load servers"), _read, on_finished=self._serversLoaded)
+            QgsApplication.taskManager().addTask(self._loadTask)
+
+    def _serversLoaded(self, exception, servers=None):
+        # Exceptions raised here are swallowed by the task, so they must be reported explicitly
+        self._loadTask = None
+        if exception is None:
+            try:
+                # The task does not pass falsy results on, so an empty list arrives as None
+                self._addLoadedServers(servers or [])
+            except Exception as e:
+                exception = e
+        if exception is not None:
+            QgsMessageLog.logMessage(str(exception), 'GeoCat Bridge', level=Qgis.Warning)
+            self.bar.pushMessage(self.tr("Could not load servers"), level=Qgis.Warning, duration=5)
+
+    def _addLoadedServers(self, servers):
+        names = set(allServers())
+        try:
+            for server in servers:
+                name = server[1].get("name")
+                if not name or name in names:
+                    continue
                 s = serverFromDefinition(server)
-                if s.name not in allServers():
-                    self.addServerItem(s)
-                    addServer(s)
+                names.add(s.name)
+                self.addServerItem(s, deferCheck=True)
+                addServer(s)
+        finally:
+            self.checkServersHaveBeenDefined()
 
     def geoserverDatastorageChanged(self):
         storage = self.comboGeoserverDataStorage.currentIndex()
@@ -137,43 +211,25 @@ class ServerConnectionsWidget(BASE, WIDGET):
         name = dlg.name
         if name is None:
             return
-        def _entry(k, v):
-            return {"@key":k, "$":v}
-        ds = {   
-            "dataStore": {
-                "name": dlg.name,
-                "type": "PostGIS",
-                "enabled": True,
-                "connectionParameters": {
-                    "entry": [
-                        _entry("schema", dlg.schema),
-                        _entry("port", dlg.port),
-                        _entry("database", dlg.database),
-                        _entry("passwd", dlg.password),
-                        _entry("user", dlg.username),
-                        _entry("host", dlg.host),
-                        _entry("dbtype", "postgis")
-                    ]                        
-                }
-            }
-        }
-        try:
-            datastores = execute(lambda: server.addPostgisDatastore(ds))
+        ds = postgisDatastoreDefinition(dlg)
+        self._datastoreTask = QgsTask.fromFunction(self.tr("Create PostGIS datastore"),
+                                                   lambda task: server.addPostgisDatastore(ds),
+                                                   on_finished=self._postgisDatastoreAdded)
+        QgsApplication.taskManager().addTask(self._datastoreTask)
+
+    def _postgisDatastoreAdded(self, exception, result=None):
+        self._datastoreTask = None
+        if exception is None:
             self.populatePostgisComboWithGeoserverPostgisServers()
-        except:
+        else:
+            QgsMessageLog.logMessage(str(exception), 'GeoCat Bridge', level=Qgis.Warning)
             self.bar.pushMessage(self.tr("Could not create new PostGIS dataset"), level=Qgis.Warning, duration=5)
 
     def mapserverStorageChanged(self, checked):
-        self.labelLocalFolder.setVisible(checked)
-        self.labelRemoteFolder.setVisible(not checked)
-        self.fileMapserver.setVisible(checked)
-        self.txtRemoteFolder.setVisible(not checked)
-        self.labelHost.setVisible(not checked)
-        self.labelPort.setVisible(not checked)
-        self.labelMapserverCredentials.setVisible(not checked)
-        self.txtMapserverHost.setVisible(not checked)
-        self.txtMapserverPort.setVisible(not checked)
-        self.mapserverAuthWidget.setVisible(not checked)
+        for w in self._mapserverLocalWidgets:
+            w.setVisible(checked)
+        for w in self._mapserverRemoteWidgets:
+            w.setVisible(not checked)
         self._setCurrentServerHasChanges()
 
     def currentServerChanged(self, new, old):
@@ -181,7 +237,7 @@ class ServerConnectionsWidget(BASE, WIDGET):
             self.setCurrentServer(new)
             return
         else:
-            name = self.listServers.itemWidget(new).serverName()
+            name = new.text()
             server = allServers()[name]
             if self.currentServer is not None and new is not None:
                 if server.name == self.currentServer.name:
@@ -248,22 +304,23 @@ class ServerConnectionsWidget(BASE, WIDGET):
         else:            
             if self.currentServer is not None:
                 removeServer(self.currentServer.name)
-                item = self.itemFromServerName(self.currentServer.name)
-                self.listServers.itemWidget(item).setServerName(server.name)
+                item = self._itemsByName.pop(self.currentServer.name)
+                item.setText(server.name)
+                self._itemsByName[server.name] = item
             addServer(server)
             self.currentServer = server
             return True
         
     def itemFromServerName(self, name):
-        for i in range(self.listServers.count()):
-            item = self.listServers.item(i)
-            if name == self.listServers.itemWidget(item).serverName():
-                return item
+        return self._itemsByName.get(name)
+
+    def _snapshot(self, fields):
+        return {field: getattr(self, field).text().strip() for field in fields}
 
     def createGeoserverServer(self):
         ##TODO check validity of name and values        
-        name = self.txtGeoserverName.text().strip()
-        url = self.txtGeoserverUrl.text().strip()
+        v = self._snapshot(("txtGeoserverName", "txtGeoserverUrl"))
+        name, url = v["txtGeoserverName"], v["txtGeoserverUrl"]
         authid = self.geoserverAuth.configId()
         if not bool(authid):
             return None
@@ -284,44 +341,38 @@ class ServerConnectionsWidget(BASE, WIDGET):
 
     def createPostgisServer(self):
         ##TODO check validity of name and values        
-        name = self.txtPostgisName.text()
-        host = self.txtPostgisServerAddress.text()
-        port = self.txtPostgisPort.text()
-        schema = self.txtPostgisSchema.text()
-        database = self.txtPostgisDatabase.text()
-        authid = self.postgisAuth.configId()                
-        server = PostgisServer(name, authid, host, port, schema, database)
+        v = self._snapshot(("txtPostgisName", "txtPostgisServerAddress", "txtPostgisPort", "txtPostgisSchema",
+                            "txtPostgisDatabase"))
+        authid = self.postgisAuth.configId()
+        server = PostgisServer(v["txtPostgisName"], authid, v["txtPostgisServerAddress"], v["txtPostgisPort"],
+                               v["txtPostgisSchema"], v["txtPostgisDatabase"])
         return server
 
     def createGeonetworkServer(self):
         ##TODO check validity of name and values        
-        name = self.txtCswName.text()
-        node = self.txtCswNode.text()
         authid = self.cswAuth.configId()
         if bool(authid):
-            url = self.txtCswUrl.text()
+            v = self._snapshot(("txtCswName", "txtCswNode", "txtCswUrl"))
             profile = self.comboMetadataProfile.currentIndex()
-            server = GeonetworkServer(name, url, authid, profile, node)
+            server = GeonetworkServer(v["txtCswName"], v["txtCswUrl"], authid, profile, v["txtCswNode"])
             return server
 
     def createMapserverServer(self):
         ##TODO check validity of name and values        
-        name = self.txtMapserverName.text()                
+        v = self._snapshot(("txtMapserverName", "txtMapserverHost", "txtMapserverPort", "txtRemoteFolder",
+                            "txtMapserverUrl", "txtMapServicesPath", "txtProjFolder"))
         authid = self.mapserverAuth.configId()
-        host = self.txtMapserverHost.text()
         try:
-            port = int(self.txtMapserverPort.text())
+            port = int(v["txtMapserverPort"])
         except:
             return None
         local = self.radioLocalPath.isChecked()
         if local:
             folder = self.fileMapserver.filePath()
         else:
-            folder = self.txtRemoteFolder.text()
-        url = self.txtMapserverUrl.text()
-        servicesPath = self.txtMapServicesPath.text()
-        projFolder = self.txtProjFolder.text()
-        server = MapserverServer(name, url, local, folder, authid, host, port, servicesPath, projFolder)
+            folder = v["txtRemoteFolder"]
+        server = MapserverServer(v["txtMapserverName"], v["txtMapserverUrl"], local, folder, authid,
+                                 v["txtMapserverHost"], port, v["txtMapServicesPath"], v["txtProjFolder"])
         return server
 
     def createGeocatLiveServer(self):
@@ -334,83 +385,62 @@ class ServerConnectionsWidget(BASE, WIDGET):
             return server        
 
     def addAuthWidgets(self):
-        self.geoserverAuth = QgsAuthConfigSelect()
-        self.geoserverAuth.selectedConfigIdChanged.connect(self._setCurrentServerHasChanges)
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.geoserverAuth)
-        self.geoserverAuthWidget.setLayout(layout)
-        self.geoserverAuthWidget.setFixedHeight(self.txtGeoserverUrl.height())
-        self.mapserverAuth = QgsAuthConfigSelect()
-        self.mapserverAuth.selectedConfigIdChanged.connect(self._setCurrentServerHasChanges)
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.mapserverAuth)
-        self.mapserverAuthWidget.setLayout(layout)
-        self.mapserverAuthWidget.setFixedHeight(self.txtGeoserverUrl.height())
-        self.postgisAuth = QgsAuthConfigSelect()        
-        self.postgisAuth.selectedConfigIdChanged.connect(self._setCurrentServerHasChanges)
+        self._authRowHeight = self.txtGeoserverUrl.sizeHint().height()
+        self.geoserverAuth = self._installAuth(self.geoserverAuthWidget)
+        self.mapserverAuth = self._installAuth(self.mapserverAuthWidget)
+        self.postgisAuth = self._installAuth(self.postgisAuthWidget)
+        self.cswAuth = self._installAuth(self.cswAuthWidget)
+        self.geocatLiveGeoserverAuth = self._installAuth(self.geocatLiveGeoserverAuthWidget)
+        self.geocatLiveGeonetworkAuth = self._installAuth(self.geocatLiveGeonetworkAuthWidget)
+
+    def _installAuth(self, host):
+        authWidget = QgsAuthConfigSelect()
+        authWidget.selectedConfigIdChanged.connect(self._setCurrentServerHasChanges)
         layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.postgisAuth)
-        self.postgisAuthWidget.setLayout(layout)
-        self.postgisAuthWidget.setFixedHeight(self.txtGeoserverUrl.height())
-        self.cswAuth = QgsAuthConfigSelect()
-        self.cswAuth.selectedConfigIdChanged.connect(self._setCurrentServerHasChanges)
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.cswAuth)
-        self.cswAuthWidget.setLayout(layout)
-        self.cswAuthWidget.setFixedHeight(self.txtGeoserverUrl.height())
-        self.geocatLiveGeoserverAuth = QgsAuthConfigSelect()
-        self.geocatLiveGeoserverAuth.selectedConfigIdChanged.connect(self._setCurrentServerHasChanges)
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.geocatLiveGeoserverAuth)
-        self.geocatLiveGeoserverAuthWidget.setLayout(layout)
-        self.geocatLiveGeoserverAuthWidget.setFixedHeight(self.txtGeoserverUrl.height())
-        self.geocatLiveGeonetworkAuth = QgsAuthConfigSelect()
-        self.geocatLiveGeonetworkAuth.selectedConfigIdChanged.connect(self._setCurrentServerHasChanges)
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.geocatLiveGeonetworkAuth)
-        self.geocatLiveGeonetworkAuthWidget.setLayout(layout)
-        self.geocatLiveGeonetworkAuthWidget.setFixedHeight(self.txtGeoserverUrl.height())
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(authWidget)
+        host.setLayout(layout)
+        # The selector combo and its tool buttons can be taller than a line edit, so do not clip them
+        host.setFixedHeight(max(self._authRowHeight, authWidget.sizeHint().height()))
+        return authWidget
 
     def addMenuToButtonNew(self):
-        menu = QMenu()
-        menu.addAction("GeoServer", lambda: self._addServer("GeoServer", GeoserverServer))
-        menu.addAction("MapServer", lambda: self._addServer("MapServer", MapserverServer))
-        menu.addAction("GeoCat Live", lambda: self._addServer("GeoCat Live", GeocatLiveServer))
-        menu.addAction("GeoNetwork", lambda: self._addServer("GeoNetwork", GeonetworkServer))
-        #menu.addAction("CSW", lambda: self._addServer("CSW", CswServer))
-        menu.addAction("PostGIS", lambda: self._addServer("PostGIS", PostgisServer))
+        menu = QMenu(self.buttonNew)
+        for label, clazz in self.NEW_SERVER_TYPES:
+            menu.addAction(label, partial(self._addServer, label, clazz))
         self.buttonNew.setMenu(menu)
 
     def buttonRemoveClicked(self):
         item = self.listServers.currentItem()
         if item is None:
             return
-        name = self.listServers.itemWidget(item).serverName()
+        name = item.text()
         removeServer(name)
+        self._itemsByName.pop(name, None)
         self.listServers.takeItem(self.listServers.currentRow())
         self.listServers.setCurrentItem(None)
         self.checkServersHaveBeenDefined()     
 
     def populateServers(self):
+        # Clearing the list must still notify currentServerChanged, so the form and current server get reset
         self.listServers.clear()
-        servers = allServers().values()      
-        for server in servers:
-            self.addServerItem(server)
+        self._itemsByName = {}
+        self.listServers.setUpdatesEnabled(False)
+        self.listServers.blockSignals(True)
+        try:
+            servers = allServers().values()
+            for server in servers:
+                self.addServerItem(server, deferCheck=True)
+        finally:
+            self.listServers.blockSignals(False)
+            self.listServers.setUpdatesEnabled(True)
         self.checkServersHaveBeenDefined()
             
-    def addServerItem(self, server):
-        widget = ServerItemWidget(server)
-        item = QListWidgetItem(self.listServers)
-        item.setSizeHint(widget.sizeHint())
-        self.listServers.addItem(item)
-        self.listServers.setItemWidget(item, widget)
-        self.checkServersHaveBeenDefined()
+    def addServerItem(self, server, deferCheck=False):
+        item = QListWidgetItem(serverIcon(server), server.name, self.listServers)
+        self._itemsByName[server.name] = item
+        if not deferCheck:
+            self.checkServersHaveBeenDefined()
         return item
 
     def _addServer(self, name, clazz):
@@ -427,9 +457,7 @@ class ServerConnectionsWidget(BASE, WIDGET):
     def populatePostgisComboWithPostgisServers(self):
         self.comboGeoserverDatabase.clear()
         servers = allServers().values()
-        for s in servers:
-            if isinstance(s, PostgisServer):
-                self.comboGeoserverDatabase.addItem(s.name)
+        self.comboGeoserverDatabase.addItems([s.name for s in servers if isinstance(s, PostgisServer)])
 
     def populatePostgisComboWithGeoserverPostgisServers(self):
         url = self.txtGeoserverUrl.text().strip()
@@ -440,7 +468,8 @@ class ServerConnectionsWidget(BASE, WIDGET):
             return
         try:
             datastores = execute(server.postgisDatastores)
-        except:
+        except (RequestException, ValueError) as e:
+            QgsMessageLog.logMessage(str(e), 'GeoCat Bridge', level=Qgis.Warning)
             datastores = []
         if datastores:
             self.comboGeoserverDatabase.addItems(datastores)
@@ -451,69 +480,73 @@ class ServerConnectionsWidget(BASE, WIDGET):
         self.currentServerHasChanges = True
 
     def setCurrentServer(self, server):
+        if server is not None and server is self.currentServer:
+            return
         self.currentServer = server
         if server is None:
             self.stackedWidget.setCurrentWidget(self.widgetEmpty)
-        elif isinstance(server, GeoserverServer):
-            self.stackedWidget.setCurrentWidget(self.widgetGeoserver)
-            self.txtGeoserverName.setText(server.name)
-            self.txtGeoserverUrl.setText(server.url)
-            self.geoserverAuth.setConfigId(server.authid)
-            self.comboGeoserverDataStorage.blockSignals(True)
+        else:
+            loader = self._loaders.get(type(server))
+            if loader is not None:
+                loader(server)
+        self.currentServerHasChanges = False
+
+    def _loadGeoserver(self, server):
+        self.stackedWidget.setCurrentWidget(self.widgetGeoserver)
+        self.txtGeoserverName.setText(server.name)
+        self.txtGeoserverUrl.setText(server.url)
+        self.geoserverAuth.setConfigId(server.authid)
+        with QSignalBlocker(self.comboGeoserverDataStorage):
             self.comboGeoserverDataStorage.setCurrentIndex(server.storage)
-            self.geoserverDatastorageChanged()            
+            self.geoserverDatastorageChanged()
             if server.postgisdb is not None:
                 self.comboGeoserverDatabase.setCurrentText(server.postgisdb)
             self.chkUseOriginalDataSource.setChecked(server.useOriginalDataSource)
             self.chkUseVectorTiles.setChecked(server.useVectorTiles)
-            self.comboGeoserverDataStorage.blockSignals(False)
-        elif isinstance(server, MapserverServer):
-            self.stackedWidget.setCurrentWidget(self.widgetMapserver)
-            self.txtMapserverName.setText(server.name)            
-            self.fileMapserver.setFilePath(server.folder)
-            self.txtRemoteFolder.setText(server.folder)
-            self.txtMapserverHost.setText(server.host)
-            self.txtMapserverPort.setText(str(server.port))
-            self.mapserverAuth.setConfigId(server.authid)
-            self.txtMapserverUrl.setText(server.url)
-            self.txtMapServicesPath.setText(server.servicesPath)
-            self.txtProjFolder.setText(server.projFolder)
-            self.radioLocalPath.setChecked(server.useLocalFolder)
-            self.radioFtp.setChecked(not server.useLocalFolder)
-            self.mapserverStorageChanged(server.useLocalFolder)
-        elif isinstance(server, PostgisServer):
-            self.stackedWidget.setCurrentWidget(self.widgetPostgis)
-            self.txtPostgisName.setText(server.name)
-            self.txtPostgisDatabase.setText(server.database)
-            self.txtPostgisPort.setText(server.port)
-            self.txtPostgisServerAddress.setText(server.host)
-            self.txtPostgisSchema.setText(server.schema)            
-            self.postgisAuth.setConfigId(server.authid)
-        elif isinstance(server, (GeonetworkServer, CswServer)):
-            self.stackedWidget.setCurrentWidget(self.widgetMetadataCatalog)
-            self.txtCswName.setText(server.name)
-            self.txtCswNode.setText(server.node)
-            self.txtCswUrl.setText(server.url)            
-            self.cswAuth.setConfigId(server.authid)
-            self.comboMetadataProfile.setCurrentIndex(server.profile)
-        elif isinstance(server, GeocatLiveServer):
-            self.stackedWidget.setCurrentWidget(self.widgetGeocatLive)
-            self.txtGeocatLiveName.setText(server.name)
-            self.txtGeocatLiveIdentifier.setText(server.userid)          
-            self.geocatLiveGeoserverAuth.setConfigId(server.geoserverAuthid)
-            self.geocatLiveGeonetworkAuth.setConfigId(server.geonetworkAuthid)
 
-        self.currentServerHasChanges = False
+    def _loadMapserver(self, server):
+        self.stackedWidget.setCurrentWidget(self.widgetMapserver)
+        self.txtMapserverName.setText(server.name)
+        self.fileMapserver.setFilePath(server.folder)
+        self.txtRemoteFolder.setText(server.folder)
+        self.txtMapserverHost.setText(server.host)
+        self.txtMapserverPort.setText(str(server.port))
+        self.mapserverAuth.setConfigId(server.authid)
+        self.txtMapserverUrl.setText(server.url)
+        self.txtMapServicesPath.setText(server.servicesPath)
+        self.txtProjFolder.setText(server.projFolder)
+        self.radioLocalPath.setChecked(server.useLocalFolder)
+        self.radioFtp.setChecked(not server.useLocalFolder)
+        self.mapserverStorageChanged(server.useLocalFolder)
+
+    def _loadPostgis(self, server):
+        self.stackedWidget.setCurrentWidget(self.widgetPostgis)
+        self.txtPostgisName.setText(server.name)
+        self.txtPostgisDatabase.setText(server.database)
+        self.txtPostgisPort.setText(server.port)
+        self.txtPostgisServerAddress.setText(server.host)
+        self.txtPostgisSchema.setText(server.schema)
+        self.postgisAuth.setConfigId(server.authid)
+
+    def _loadMetadataCatalog(self, server):
+        self.stackedWidget.setCurrentWidget(self.widgetMetadataCatalog)
+        self.txtCswName.setText(server.name)
+        self.txtCswNode.setText(server.node)
+        self.txtCswUrl.setText(server.url)
+        self.cswAuth.setConfigId(server.authid)
+        self.comboMetadataProfile.setCurrentIndex(server.profile)
+
+    def _loadGeocatLive(self, server):
+        self.stackedWidget.setCurrentWidget(self.widgetGeocatLive)
+        self.txtGeocatLiveName.setText(server.name)
+        self.txtGeocatLiveIdentifier.setText(server.userid)
+        self.geocatLiveGeoserverAuth.setConfigId(server.geoserverAuthid)
+        self.geocatLiveGeonetworkAuth.setConfigId(server.geonetworkAuthid)
 
     def getNewName(self, name):
-        servers = list(allServers().keys())
-        i = 1
-        while True:
-            n = name + str(i)
-            if n not in servers:
-                return n
-            else:
-                i += 1
+        suffixes = [k[len(name):] for k in allServers() if k.startswith(name)]
+        numbers = [int(suffix) for suffix in suffixes if suffix.isdecimal()]
+        return name + str(max(numbers) + 1 if numbers else 1)
 
     def saveButtonClicked(self):
         if self.saveCurrentServer():
@@ -530,27 +563,3 @@ class ServerConnectionsWidget(BASE, WIDGET):
             return res == QMessageBox.Yes                
         else:
             return True
-
-class ServerItemWidget(QWidget):
-    def __init__ (self, server, parent = None):
-        super(ServerItemWidget, self).__init__(parent)
-        self.server = server
-        self.layout = QHBoxLayout()
-        self.label = QLabel()
-        self.label.setText(server.name)
-        self.iconLabel = QLabel()
-        self.iconLabel.setPixmap(QPixmap(self.iconPath(server)))
-        self.iconLabel.setFixedWidth(50)
-        self.layout.addWidget(self.iconLabel)
-        self.layout.addWidget(self.label)
-        self.setLayout(self.layout)
-        
-    def iconPath(self, server):
-        return os.path.join(os.path.dirname(os.path.dirname(__file__)), "icons", 
-                        "%s_black.png" % self.server.__class__.__name__.lower()[:-6])
-
-    def setServerName(self, name):
-        self.label.setText(name)
-
-    def serverName(self):
-        return self.label.text()
\ No newline at end of file
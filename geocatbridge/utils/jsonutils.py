@@ -0,0 +1,23 @@
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+# orjson is not bundled with QGIS, so fall back to the stdlib json module when it is missing.
+# Both variants of dumps() return a str, so callers do not need to know which one is in use.
+# orjson does not escape non-ASCII characters, so files must be written as UTF-8 and read in binary mode,
+# which load() supports in both variants.
+if orjson is not None:
+    def loads(s):
+        return orjson.loads(s)
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode("utf-8")
+
+    def load(f):
+        return orjson.loads(f.read())
+else:
+    loads = json.loads
+    dumps = json.dumps
+    load = json.load